@@ -1,5 +1,15 @@
 """Emergency Dispatcher Agents Package"""
 
-from .graph import dispatcher_graph, DispatcherState, build_dispatcher_graph
+from .context import CallIdFilter, call_id, new_call_id
+from .graph import dispatcher_graph, DispatcherState, build_dispatcher_graph, run_batch, close_http_clients
 
-__all__ = ["dispatcher_graph", "DispatcherState", "build_dispatcher_graph"]
+__all__ = [
+    "dispatcher_graph",
+    "DispatcherState",
+    "build_dispatcher_graph",
+    "run_batch",
+    "close_http_clients",
+    "CallIdFilter",
+    "call_id",
+    "new_call_id",
+]
@@ -0,0 +1,98 @@
+"""
+Agent Response Cache
+
+In-process cache for deterministic agent results, keyed by a hash of the
+state fields each agent reads. Repeated transcripts (demo replays, retries,
+training runs) skip the LLM call entirely.
+"""
+
+import copy
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _normalize(value: Any) -> Any:
+    """Collapse whitespace in strings so formatting-only differences share a key."""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+
+def state_key(state: dict, fields: tuple[str, ...]) -> str:
+    """Hash the given state fields into a stable cache key."""
+    payload = orjson.dumps(
+        [_normalize(state.get(field)) for field in fields],
+        option=orjson.OPT_SORT_KEYS,
+        default=str,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+def cached_agent(agent_name: str, cache: TTLCache, key_fields: tuple[str, ...] = ("transcript",)):
+    """
+    Decorator that caches an async agent's result by the state fields it reads.
+
+    Results containing `agent_errors` (fallback responses) are never cached.
+    Cached results are deep-copied on the way out so callers can't mutate
+    the stored entry.
+
+    Args:
+        agent_name: Name of the agent for logging
+        cache: Cache instance to store results in
+        key_fields: State fields that fully determine the agent's output
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(func)
+        async def wrapper(state: dict, *args, **kwargs) -> dict:
+            key = state_key(state, key_fields)
+            cached = cache.get(key)
+            if cached is not None:
+                logger.debug("[%s] Cache hit", agent_name)
+                return copy.deepcopy(cached)
+
+            result = await func(state, *args, **kwargs)
+            if "agent_errors" not in result:
+                cache.set(key, copy.deepcopy(result))
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,27 @@
+"""
+Call Context
+
+Per-call identifiers carried through the agent pipeline so log lines from
+concurrent calls can be told apart.
+"""
+
+import logging
+import uuid
+from contextvars import ContextVar
+
+call_id: ContextVar[str] = ContextVar("call_id", default="-")
+
+
+def new_call_id() -> str:
+    """Assign a fresh call ID to the current context and return it."""
+    value = uuid.uuid4().hex[:12]
+    call_id.set(value)
+    return value
+
+
+class CallIdFilter(logging.Filter):
+    """Stamp each log record with the current call ID as `record.call_id`."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.call_id = call_id.get()
+        return True
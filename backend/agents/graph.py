@@ -6,22 +6,30 @@ and provide dispatch recommendations.
 """
 
 import os
+import re
 import json
+import asyncio
+import inspect
 import logging
-import traceback
 from pathlib import Path
-from typing import Literal, Annotated, Callable, TypeVar
-from functools import wraps
-from typing_extensions import TypedDict
+from typing import Literal, Annotated, Callable, NamedTuple, TypeVar
+from functools import lru_cache, wraps
+from operator import add, attrgetter
+from typing_extensions import Required, TypedDict
 
+import httpx
+import orjson
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 from langchain_groq import ChatGroq
-from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from .cache import TTLCache, cached_agent
+from .context import call_id, new_call_id
+
+# Logging is configured by the application entry point (see main.py)
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
@@ -45,7 +53,7 @@ class AgentError(Exception):
 T = TypeVar('T')
 
 
-def with_error_handling(agent_name: str, default_return: dict | Callable[[], dict]):
+def with_error_handling(agent_name: str, default_return: dict | Callable[[dict], dict]):
     """
     Decorator that wraps agent functions with error handling.
     
@@ -54,85 +62,247 @@ def with_error_handling(agent_name: str, default_return: dict | Callable[[], dic
     - Graceful fallback to default values
     - Consistent error structure in the response
     
+    Works with both sync and async (coroutine) agent functions.
+    
     Args:
         agent_name: Name of the agent for logging
-        default_return: Default dict to return on error, or a callable that returns a dict
+        default_return: Default dict to return on error, or a callable that
+            takes the agent's state and returns a dict
     """
     def decorator(func: Callable[..., dict]) -> Callable[..., dict]:
+        def handle_error(e: Exception, state: dict) -> dict:
+            """Log the error and build the fallback response (call from an except block)."""
+            fallback = default_return(state) if callable(default_return) else default_return
+            if isinstance(e, AgentError):
+                log = logger.warning if e.recoverable else logger.error
+                log("%s. Using fallback response.", e)
+                message = e.message
+            elif isinstance(e, json.JSONDecodeError):
+                logger.warning("[%s] JSON parsing error: %s. Using fallback response.", agent_name, e)
+                message = f"JSON parsing error: {e}"
+            elif isinstance(e, ValueError):
+                logger.error("[%s] Configuration error: %s", agent_name, e)
+                message = f"Configuration error: {e}"
+            elif isinstance(e, ConnectionError):
+                logger.error("[%s] Connection error: %s", agent_name, e)
+                message = f"Connection error: {e}"
+            else:
+                # logger.exception defers traceback formatting to the handler
+                logger.exception("[%s] Unexpected error: %s", agent_name, e)
+                message = f"Unexpected error: {e}"
+            # Reported through the accumulating agent_errors state channel;
+            # LangGraph drops update keys that aren't in the state schema
+            return {**fallback, "agent_errors": [f"{agent_name}: {message}"]}
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(state: dict, *args, **kwargs) -> dict:
+                try:
+                    return await func(state, *args, **kwargs)
+                except Exception as e:
+                    return handle_error(e, state)
+            return async_wrapper
+        
         @wraps(func)
-        def wrapper(*args, **kwargs) -> dict:
+        def wrapper(state: dict, *args, **kwargs) -> dict:
             try:
-                return func(*args, **kwargs)
-            except json.JSONDecodeError as e:
-                logger.warning(
-                    f"[{agent_name}] JSON parsing error: {e}. Using fallback response."
-                )
-                fallback = default_return() if callable(default_return) else default_return
-                return {**fallback, "_error": f"JSON parsing error: {str(e)}"}
-            except ValueError as e:
-                logger.error(f"[{agent_name}] Configuration error: {e}")
-                fallback = default_return() if callable(default_return) else default_return
-                return {**fallback, "_error": f"Configuration error: {str(e)}"}
-            except ConnectionError as e:
-                logger.error(f"[{agent_name}] Connection error: {e}")
-                fallback = default_return() if callable(default_return) else default_return
-                return {**fallback, "_error": f"Connection error: {str(e)}"}
+                return func(state, *args, **kwargs)
             except Exception as e:
-                logger.error(
-                    f"[{agent_name}] Unexpected error: {e}\n{traceback.format_exc()}"
-                )
-                fallback = default_return() if callable(default_return) else default_return
-                return {**fallback, "_error": f"Unexpected error: {str(e)}"}
+                return handle_error(e, state)
         return wrapper
     return decorator
 
 
-def safe_json_parse(content: str, agent_name: str) -> dict | None:
+def safe_json_parse(content: str, agent_name: str, json_mode: bool = True) -> dict:
     """
-    Safely parse JSON content with error logging.
+    Parse JSON content from an agent's model response.
     
-    Attempts to extract JSON from the content even if it contains
-    extra text before or after the JSON object.
-    """
-    content = content.strip()
+    Responses from JSON-mode clients are a single JSON object, so they are
+    parsed directly. For free-text responses (streaming clients, which
+    can't use JSON mode), attempts to extract JSON from the content even if
+    it contains extra text before or after the JSON object.
     
-    # Try direct parse first
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        pass
+    Raises:
+        AgentError: If no JSON object can be parsed; with_error_handling
+            turns this into the agent's fallback response.
+    """
+    # Well-formed responses are a bare object: parse directly (orjson skips
+    # surrounding whitespace). Free text that doesn't open with an object,
+    # e.g. a markdown-fenced reply, goes straight to the scan below.
+    if json_mode or content.lstrip().startswith("{"):
+        try:
+            return _require_object(orjson.loads(content), agent_name)
+        except orjson.JSONDecodeError:
+            if json_mode:
+                logger.warning("[%s] Invalid JSON-mode response: %.200s...", agent_name, content)
+                raise AgentError(agent_name, "JSON parse failed")
     
-    # Try to find JSON object in the content
+    # Try to find JSON object in the content (a linear scan, no regex
+    # backtracking on long replies)
     try:
         # Find first { and last }
         start = content.find('{')
         end = content.rfind('}')
         if start != -1 and end != -1 and end > start:
             json_str = content[start:end + 1]
-            return json.loads(json_str)
-    except json.JSONDecodeError:
+            return _require_object(orjson.loads(json_str), agent_name)
+    except orjson.JSONDecodeError:
         pass
     
-    logger.warning(f"[{agent_name}] Could not parse JSON from response: {content[:200]}...")
-    return None
+    logger.warning("[%s] Could not parse JSON from response: %.200s...", agent_name, content)
+    raise AgentError(agent_name, "JSON parse failed")
+
+
+def _require_object(parsed, agent_name: str) -> dict:
+    """Reject valid JSON that isn't an object (e.g. a bare list or string)."""
+    if not isinstance(parsed, dict):
+        raise AgentError(agent_name, "JSON response is not an object")
+    return parsed
+
+
+def as_text(value, default: str | None = None) -> str | None:
+    """A model-supplied string field, or `default` if missing or not a string."""
+    return value if isinstance(value, str) and value else default
+
+
+def as_text_list(value) -> list[str]:
+    """A model-supplied list-of-strings field; a bare string becomes one item."""
+    if isinstance(value, str):
+        return [value] if value else []
+    if not isinstance(value, list):
+        return []
+    return [item if isinstance(item, str) else str(item) for item in value if item is not None]
+
+
+def to_prompt_json(obj) -> str:
+    """
+    Serialize state data for an LLM prompt.
+    
+    orjson output is compact - indentation adds tokens (and prefill latency)
+    without helping the model read the data. Keys are sorted so identical
+    state always renders to an identical prompt, which keeps provider-side
+    prefix caching effective.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode()
+
+
+def extracted_to_prompt(extracted: dict) -> str:
+    """
+    Serialize extracted details for a prompt, leaving out null fields.
+    
+    Unknown fields carry no information for the model (missing keys read
+    the same as nulls) but each costs prompt tokens on every downstream call.
+    """
+    return to_prompt_json({key: value for key, value in extracted.items() if value is not None})
+
+
+def render_extracted(state: dict) -> str:
+    """
+    Prompt rendering of the extracted details.
+    
+    Rendered once by the extraction agent and reused by every downstream
+    prompt; re-rendered only if extraction fell back without it.
+    """
+    return state.get("extracted_json") or extracted_to_prompt(state.get("extracted", {}))
 
 
 # =============================================================================
 # Model Configuration
 # =============================================================================
 
-def get_model():
-    """Get the Groq model instance."""
+# Model per speed tier. Mechanical JSON reshaping runs on the 8B instant
+# model (lower TTFT, higher tokens/sec); judgment-heavy agents keep the 70B.
+MODEL_TIERS = {
+    "instant": "llama-3.1-8b-instant",
+    "balanced": "llama-3.3-70b-versatile",
+}
+
+# Speed tier per agent role. Field extraction, follow-up questions and the
+# triage draft are handled well by the 8B model; severity verification,
+# resource planning and the safety guardrail (which writes the dispatcher
+# script, without JSON mode) stay on the 70B.
+AGENT_MODEL_TIERS = {
+    "extraction": "instant",
+    "triage_draft": "instant",
+    "triage": "balanced",
+    "next_question": "instant",
+    "combined_assessment": "balanced",
+    "dispatch_planner": "balanced",
+    "safety_guardrail": "balanced",
+}
+
+# Keep-alive pools shared by every agent call so TCP/TLS handshakes to the
+# Groq endpoint are paid once per connection, not once per LLM request.
+# Sized for concurrent graph runs (parallel branches x in-flight requests /
+# run_batch workers) so calls don't queue waiting for a free connection.
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+http_client = httpx.Client(limits=HTTP_LIMITS)
+http_async_client = httpx.AsyncClient(limits=HTTP_LIMITS)
+
+
+async def close_http_clients() -> None:
+    """Close the shared Groq connection pools (call once on app shutdown)."""
+    http_client.close()
+    await http_async_client.aclose()
+
+
+# Output token cap per agent, sized to each agent's JSON schema with some
+# headroom. Decode time is roughly linear in output tokens, so this bounds
+# the worst case when a model starts rambling.
+MAX_OUTPUT_TOKENS = {
+    "extraction": 256,
+    "triage": 256,
+    "next_question": 256,
+    "combined_assessment": 512,
+    "dispatch_planner": 256,
+    "safety_guardrail": 512,
+}
+
+
+def get_model(tier: str = "balanced", stream: bool = False):
+    """
+    Get the shared Groq model instance for a speed tier.
+    
+    One client is built and cached per tier, and all tiers reuse the same
+    HTTP connection pool instead of opening new connections.
+    
+    Args:
+        tier: Key into MODEL_TIERS ("instant" or "balanced")
+        stream: Return a client whose tokens are streamed to graph consumers
+            (astream with stream_mode="messages"). Streaming clients do not
+            use JSON mode, which Groq does not support while streaming.
+    """
+    if tier not in MODEL_TIERS:
+        raise ValueError(f"Unknown model tier: {tier}")
+    return _build_model(MODEL_TIERS[tier], stream)
+
+
+@lru_cache(maxsize=None)
+def _build_model(model_name: str, stream: bool) -> ChatGroq:
+    """Construct a ChatGroq client (cached per model name and stream flag)."""
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         raise ValueError("GROQ_API_KEY not found. Please set it in backend/.env")
     
+    if stream:
+        mode_kwargs = {}
+    else:
+        mode_kwargs = {
+            # JSON mode: the decoder is constrained to emit a single valid JSON
+            # object, so responses never carry prose before/after the payload
+            "model_kwargs": {"response_format": {"type": "json_object"}},
+            "disable_streaming": True,
+        }
+    
     return ChatGroq(
-        model="llama-3.3-70b-versatile",  # Free tier model
+        model=model_name,  # Free tier models
         temperature=0.1,
         api_key=api_key,
         timeout=30,  # Add timeout to prevent hanging
         max_retries=2,  # Add retries for transient errors
+        http_client=http_client,
+        http_async_client=http_async_client,
+        **mode_kwargs,
     )
 
 
@@ -140,14 +310,21 @@ def get_model():
 # State Schema
 # =============================================================================
 
-class DispatcherState(TypedDict):
-    """Shared state across all agents in the dispatcher graph."""
+class DispatcherState(TypedDict, total=False):
+    """
+    Shared state across all agents in the dispatcher graph.
+    
+    A plain TypedDict on purpose: LangGraph passes it through as a dict with
+    no per-node validation. Only the transcript is guaranteed; every other
+    key appears once the node that owns it has run, hence state.get(...).
+    """
     
     # Input
-    transcript: str
+    transcript: Required[str]
     
     # Extraction Agent
     extracted: dict  # location, injuries, hazards, people_count, weapons, etc.
+    extracted_json: str  # `extracted` pre-rendered for downstream prompts
     
     # Triage Agent
     incident_type: str
@@ -168,14 +345,238 @@ class DispatcherState(TypedDict):
     # Guardrail validation
     validated_output: dict
     
+    # Fallbacks used by with_error_handling ("agent: message"), accumulated
+    # across nodes, including parallel branches
+    agent_errors: Annotated[list[str], add]
+    
     # Message history for agent reasoning
     messages: Annotated[list, add_messages]
 
 
+# =============================================================================
+# System Prompts
+# =============================================================================
+# Built once at import and shared by every call; only the human message
+# carrying the per-call context is constructed per invocation. Keeping the
+# static system prompt first and all dynamic content in the trailing human
+# message gives Groq's prompt caching an identical prefix on every call.
+
+EXTRACTION_PROMPT = SystemMessage(content="""You are an Extraction Agent for emergency dispatch.
+Your job is to extract critical information from emergency call transcripts.
+
+Extract the following fields (use null if not mentioned):
+- location: address, cross streets, landmarks
+- injuries: type and description of injuries/symptoms
+- hazards: weapons, fire, smoke, chemicals, etc.
+- people_count: number of people involved/affected
+- caller_info: who is calling, their relation to the incident
+
+Respond ONLY with valid JSON in this exact format:
+{
+    "location": "string or null",
+    "injuries": "string or null",
+    "hazards": "string or null",
+    "people_count": "number or null",
+    "caller_info": "string or null"
+}""")
+
+TRIAGE_PROMPT = SystemMessage(content="""You are a Triage Agent for emergency dispatch.
+Based on the caller transcript, classify the emergency.
+
+Priority levels:
+- P1: Life-threatening, immediate response (cardiac arrest, active shooter, structure fire with entrapment)
+- P2: Urgent, serious but stable (chest pain, house fire no entrapment, assault in progress)
+- P3: Non-urgent, needs response (minor injuries, property crime, small fire contained)
+- P4: Low priority, can wait (noise complaint, non-injury accident, information only)
+
+Respond ONLY with valid JSON in this exact format:
+{
+    "incident_type": "brief description like 'possible cardiac arrest' or 'house fire with entrapment'",
+    "severity": "P1 or P2 or P3 or P4",
+    "key_risks": ["list", "of", "key", "risks"]
+}""")
+
+NEXT_QUESTION_PROMPT = SystemMessage(content="""You are a Next-Question Agent for emergency dispatch.
+Suggest ONE helpful follow-up question the dispatcher should ask.
+
+Never repeat a question the caller already answered. For life-threatening emergencies
+help is ALREADY being dispatched: ask an actionable question about safety, preparing
+for responders, or additional victims (e.g. "Is he lying flat on a hard surface?").
+
+Policy: questions must be empathetic, non-judgmental, trauma-informed, plain-language,
+safety-focused, and non-discriminatory (never ask about immigration, insurance, race,
+or income).
+
+Respond ONLY with valid JSON:
+{
+    "missing_info": ["only info NOT already provided"],
+    "suggested_questions": ["One actionable, non-redundant question"],
+    "info_complete": false
+}
+
+Set info_complete to true if caller has provided: location + what happened + victim status.
+For life-threatening emergencies, be LENIENT - help is already on the way.""")
+
+# Extra guidance sent only when the transcript suggests a sensitive situation
+NEXT_QUESTION_SENSITIVE_PROMPT = SystemMessage(content="""This call may involve domestic violence, abuse, a child, or self-harm.
+- Caller safety first: "Are you somewhere safe to talk right now?"
+- If the caller may be overheard, ask yes/no questions: "Can you answer yes or no?"
+- Never blame the caller or question their choices.
+- With a child, speak simply: "Is there a grown-up with you?"
+""")
+
+SENSITIVE_TOPIC_PATTERN = re.compile(
+    r"\b(domestic|abus\w*|hit(s|ting)? me|beat(s|ing)? (me|her|him)|rape\w*|assault\w*|child(ren)?|kids?"
+    r"|my (son|daughter)|suicid\w*|kill (my|him|her)self|self[- ]harm|overdos\w*)\b",
+    re.IGNORECASE,
+)
+
+COMBINED_ASSESSMENT_PROMPT = SystemMessage(content="""You are an Assessment Agent for emergency dispatch.
+In one pass, extract the call details, classify the emergency, and suggest ONE follow-up question.
+
+Priority levels:
+- P1: Life-threatening, immediate response (cardiac arrest, active shooter, structure fire with entrapment)
+- P2: Urgent, serious but stable (chest pain, house fire no entrapment, assault in progress)
+- P3: Non-urgent, needs response (minor injuries, property crime, small fire contained)
+- P4: Low priority, can wait (noise complaint, non-injury accident, information only)
+
+Use null for details not mentioned. Never ask a question the caller already answered.
+Questions must be empathetic, non-judgmental, plain-language, and safety-focused.
+Set info_complete to true if caller has provided: location + what happened + victim status.
+
+Respond ONLY with valid JSON in this exact format:
+{
+    "extracted": {
+        "location": "string or null",
+        "injuries": "string or null",
+        "hazards": "string or null",
+        "people_count": "number or null",
+        "caller_info": "string or null"
+    },
+    "incident_type": "brief description like 'noise complaint' or 'minor fender bender'",
+    "severity": "P1 or P2 or P3 or P4",
+    "key_risks": ["list", "of", "key", "risks"],
+    "missing_info": ["only info NOT already provided"],
+    "suggested_questions": ["One actionable, non-redundant question"],
+    "info_complete": false
+}""")
+
+# Transcript keywords that corroborate a P1 label from the instant model.
+# Only P1 is accepted without the 70B pass: it can only escalate a call,
+# whereas a wrong low-priority draft would downgrade one unchecked.
+TRIAGE_FAST_P1_PATTERN = re.compile(
+    r"\b(cardiac arrest|not breathing|stopped breathing|no pulse|shooter|shots? fired"
+    r"|trapped|entrapment|pinned)\b",
+    re.IGNORECASE,
+)
+
+DISPATCH_PLANNER_PROMPT = SystemMessage(content="""You are a Dispatch Planner Agent for emergency services.
+Based on the incident information, recommend which resources to dispatch.
+
+Respond ONLY with valid JSON:
+{"resources": {"ems": "yes", "fire": "no", "police": "yes"}, "priority": "P1", "rationale": "Brief reason", "special_units": []}
+
+Rules:
+- ems/fire/police: "yes" if needed, "no" if not
+- priority: P1 (life-threatening), P2 (urgent), P3 (non-urgent), P4 (low)
+- special_units: HAZMAT, K9, SWAT if needed, otherwise empty []""")
+
+SAFETY_GUARDRAIL_PROMPT = SystemMessage(content="""You are a Safety Guardrail Agent for emergency dispatch.
+Your job is to validate and sanitize the dispatch recommendations before they are shown to the dispatcher.
+
+Rules:
+1. Frame all outputs as RECOMMENDATIONS, not commands (e.g., "Recommend dispatching..." not "Dispatch...")
+2. Ensure no harmful or inappropriate language
+3. Verify the response makes sense given the incident
+4. Add safety reminders for responders if needed
+5. Flag any concerns about the recommendations
+
+Respond ONLY with valid JSON in this exact format:
+{
+    "sanitized_recommendation": {
+        "dispatcher_script": "What the dispatcher should say to the caller",
+        "summary": "Brief summary of recommended action",
+        "resources": ["list of resources to dispatch"],
+        "priority": "P1/P2/P3/P4",
+        "eta_summary": "Nearest unit ETA",
+        "safety_notes": ["any safety reminders for responders"]
+    },
+    "is_valid": true,
+    "flags": ["any concerns or issues to highlight"],
+    "blocked": false,
+    "block_reason": null
+}""")
+
+# Prompt templates are built once at import. System messages are passed in
+# as message objects so the braces in their JSON examples are not parsed as
+# template variables; only the human turn is formatted per call.
+EXTRACTION_TEMPLATE = ChatPromptTemplate.from_messages([
+    EXTRACTION_PROMPT,
+    ("human", "Transcript: {transcript}"),
+])
+
+TRIAGE_TEMPLATE = ChatPromptTemplate.from_messages([
+    TRIAGE_PROMPT,
+    ("human", "Transcript: {transcript}"),
+])
+
+_NEXT_QUESTION_HUMAN = ("human", "Transcript: {transcript}\n\nExtracted Information: {extracted}")
+NEXT_QUESTION_TEMPLATE = ChatPromptTemplate.from_messages([
+    NEXT_QUESTION_PROMPT,
+    _NEXT_QUESTION_HUMAN,
+])
+NEXT_QUESTION_SENSITIVE_TEMPLATE = ChatPromptTemplate.from_messages([
+    NEXT_QUESTION_PROMPT,
+    NEXT_QUESTION_SENSITIVE_PROMPT,
+    _NEXT_QUESTION_HUMAN,
+])
+
+COMBINED_ASSESSMENT_TEMPLATE = ChatPromptTemplate.from_messages([
+    COMBINED_ASSESSMENT_PROMPT,
+    ("human", "Transcript: {transcript}"),
+])
+
+DISPATCH_PLANNER_TEMPLATE = ChatPromptTemplate.from_messages([
+    DISPATCH_PLANNER_PROMPT,
+    ("human", """Incident Type: {incident_type}
+Severity: {severity}
+Key Risks: {key_risks}
+
+Extracted Information: {extracted}
+
+Original Transcript: {transcript}"""),
+])
+
+SAFETY_GUARDRAIL_TEMPLATE = ChatPromptTemplate.from_messages([
+    SAFETY_GUARDRAIL_PROMPT,
+    ("human", """Incident Type: {incident_type}
+Severity: {severity}
+
+Dispatch Recommendation: {dispatch_recommendation}
+
+Nearest Resources: {nearest_resources}
+
+Key Risks: {key_risks}"""),
+])
+
+
+# =============================================================================
+# Response Caches
+# =============================================================================
+# Extraction and triage are near-deterministic (temperature 0.1) functions
+# of their inputs, so repeated transcripts (frontend re-submits during a live
+# call, retries, demo replays) are served from memory. Keys only match the
+# exact transcript (modulo whitespace): any new caller content must re-run.
+
+extraction_cache = TTLCache(maxsize=256, ttl=600)
+triage_cache = TTLCache(maxsize=256, ttl=600)
+
+
 # =============================================================================
 # Agent Nodes
 # =============================================================================
 
+@cached_agent("extraction", extraction_cache)
 @with_error_handling("extraction", {
     "extracted": {
         "location": None,
@@ -185,7 +586,7 @@ class DispatcherState(TypedDict):
         "caller_info": None,
     }
 })
-def extraction_agent(state: DispatcherState) -> dict:
+async def extraction_agent(state: DispatcherState) -> dict:
     """
     Extraction Agent
     
@@ -196,103 +597,84 @@ def extraction_agent(state: DispatcherState) -> dict:
     - Number of people
     - Weapons/fire/smoke
     """
-    model = get_model()
+    model = get_model(AGENT_MODEL_TIERS["extraction"])
     
-    system_prompt = """You are an Extraction Agent for emergency dispatch.
-Your job is to extract critical information from emergency call transcripts.
-
-Extract the following fields (use null if not mentioned):
-- location: address, cross streets, landmarks
-- injuries: type and description of injuries/symptoms
-- hazards: weapons, fire, smoke, chemicals, etc.
-- people_count: number of people involved/affected
-- caller_info: who is calling, their relation to the incident
-
-Respond ONLY with valid JSON in this exact format:
-{
-    "location": "string or null",
-    "injuries": "string or null",
-    "hazards": "string or null",
-    "people_count": "number or null",
-    "caller_info": "string or null"
-}"""
-
-    response = model.invoke([
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=f"Transcript: {state['transcript']}")
-    ])
+    messages = EXTRACTION_TEMPLATE.format_messages(transcript=state["transcript"])
+    response = await model.ainvoke(messages, max_tokens=MAX_OUTPUT_TOKENS["extraction"])
     
     extracted = safe_json_parse(response.content, "extraction")
-    if extracted is None:
-        extracted = {"raw_response": response.content[:500]}
     
-    logger.info(f"[extraction] Extracted: {list(extracted.keys())}")
-    return {"extracted": extracted}
+    logger.debug("[extraction] Extracted: %s", list(extracted))
+    return {"extracted": extracted, "extracted_json": extracted_to_prompt(extracted)}
+
+
+def is_confident_triage(result: dict, transcript: str) -> bool:
+    """Whether a draft P1 label is corroborated by the transcript itself."""
+    return (
+        isinstance(result, dict)
+        and result.get("severity") == "P1"
+        and TRIAGE_FAST_P1_PATTERN.search(transcript) is not None
+    )
 
 
+@cached_agent("triage", triage_cache)
 @with_error_handling("triage", {
     "incident_type": "unknown - processing error",
     "severity": "P2",
     "key_risks": ["Unable to complete triage - manual review recommended"]
 })
-def triage_agent(state: DispatcherState) -> dict:
+async def triage_agent(state: DispatcherState) -> dict:
     """
     Triage Agent
     
-    Uses extracted details to identify:
+    Classifies the raw transcript to identify:
     - Incident type (cardiac arrest, house fire, etc.)
     - Severity/priority level
     - Key risks
-    """
-    model = get_model()
     
-    system_prompt = """You are a Triage Agent for emergency dispatch.
-Based on the extracted information, classify the emergency.
-
-Priority levels:
-- P1: Life-threatening, immediate response (cardiac arrest, active shooter, structure fire with entrapment)
-- P2: Urgent, serious but stable (chest pain, house fire no entrapment, assault in progress)
-- P3: Non-urgent, needs response (minor injuries, property crime, small fire contained)
-- P4: Low priority, can wait (noise complaint, non-injury accident, information only)
-
-Respond ONLY with valid JSON in this exact format:
-{
-    "incident_type": "brief description like 'possible cardiac arrest' or 'house fire with entrapment'",
-    "severity": "P1 or P2 or P3 or P4",
-    "key_risks": ["list", "of", "key", "risks"]
-}"""
-
-    context = f"""Transcript: {state['transcript']}
-    
-Extracted Information: {json.dumps(state.get('extracted', {}), indent=2)}"""
-
-    response = model.invoke([
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=context)
-    ])
-    
-    result = safe_json_parse(response.content, "triage")
-    if result is None:
-        return {
-            "incident_type": "unknown",
-            "severity": "P2",
-            "key_risks": ["Unable to parse triage response"]
-        }
+    Runs concurrently with extraction, so it does not wait on extracted details.
+    """
+    messages = TRIAGE_TEMPLATE.format_messages(transcript=state["transcript"])
+
+    # Only a P1 draft backed by a P1 keyword can be accepted, so the instant
+    # model is tried only for those transcripts; everything else (and any
+    # draft it doesn't confirm) goes to the balanced model
+    confident = False
+    if TRIAGE_FAST_P1_PATTERN.search(state["transcript"]):
+        response = await get_model(AGENT_MODEL_TIERS["triage_draft"]).ainvoke(
+            messages, max_tokens=MAX_OUTPUT_TOKENS["triage"]
+        )
+        try:
+            result = safe_json_parse(response.content, "triage")
+            confident = is_confident_triage(result, state["transcript"])
+        except AgentError:
+            pass
+    if not confident:
+        response = await get_model(AGENT_MODEL_TIERS["triage"]).ainvoke(
+            messages, max_tokens=MAX_OUTPUT_TOKENS["triage"]
+        )
+        result = safe_json_parse(response.content, "triage")
+    else:
+        logger.debug("[triage] Accepted instant-model severity")
     
-    logger.info(f"[triage] Incident: {result.get('incident_type')}, Severity: {result.get('severity')}")
+    logger.info("[triage] Incident: %s, Severity: %s", result.get("incident_type"), result.get("severity"))
     return {
-        "incident_type": result.get("incident_type", "unknown"),
-        "severity": result.get("severity"),
-        "key_risks": result.get("key_risks", [])
+        "incident_type": as_text(result.get("incident_type"), "unknown"),
+        "severity": as_text(result.get("severity")),
+        "key_risks": as_text_list(result.get("key_risks")),
     }
 
 
+# Extracted fields that together make the caller's information complete
+REQUIRED_INFO_FIELDS = ("location", "injuries", "people_count")
+
+
 @with_error_handling("next_question", {
     "missing_info": ["Unable to analyze - manual review needed"],
     "suggested_questions": ["Can you confirm your exact location?", "Is anyone injured?", "Are you in a safe place?"],
     "info_complete": False
 })
-def next_question_agent(state: DispatcherState) -> dict:
+async def next_question_agent(state: DispatcherState) -> dict:
     """
     Next-Question Agent
     
@@ -300,87 +682,94 @@ def next_question_agent(state: DispatcherState) -> dict:
     based on what's missing (address, breathing status, hazards, etc.)
     
     Questions must be ethically appropriate, empathetic, and trauma-informed.
+    
+    Runs in parallel with triage, so it works from the transcript and
+    extracted details only. Skips the LLM call entirely when extraction
+    already captured every field needed to call the information complete.
+    
+    Its tokens are streamed to /dispatch/stream clients so the suggested
+    question can be shown before the rest of the pipeline finishes.
     """
-    model = get_model()
+    extracted = state.get("extracted", {})
+    if all(extracted.get(field) is not None for field in REQUIRED_INFO_FIELDS):
+        logger.debug("[next_question] Extracted info already complete - skipping LLM call")
+        return {
+            "missing_info": [],
+            "suggested_questions": [],
+            "info_complete": True
+        }
     
-    system_prompt = """You are a Next-Question Agent for emergency dispatch.
-Suggest ONE helpful follow-up question the dispatcher should ask.
-
-=== CRITICAL RULES ===
-
-1. NEVER REPEAT A QUESTION THE CALLER ALREADY ANSWERED
-   - If they said "he's not breathing well" - do NOT ask about breathing again
-   - If they gave a location - do NOT ask for the address again
-   - Read the transcript carefully and acknowledge what they've already told you
-
-2. FOR P1/P2 EMERGENCIES: Help is ALREADY being dispatched.
-   - Ask ACTIONABLE questions that help the situation
-   - Focus on: safety, preparing for responders, or additional victims
-   - Good: "Is he on a flat surface in case we need to start CPR?"
-   - Good: "Can someone meet the ambulance at the entrance?"
-   - Good: "Is there anyone else who needs help?"
-
-3. ACKNOWLEDGE CRITICAL SYMPTOMS when mentioned:
-   - Blue lips, not breathing, unconscious, chest pain, bleeding heavily
-   - These are serious - don't ask redundant questions about them
-
-=== QUESTION TYPES BY SITUATION ===
-
-Medical emergency (cardiac, breathing):
-- "Is he lying flat on a hard surface?"
-- "Is there a defibrillator (AED) nearby?"
-- "Can someone go outside to flag down the ambulance?"
-
-Fire emergency:
-- "Is everyone out of the building?"
-- "Do you know if anyone else is still inside?"
-
-Violence/Crime:
-- "Are you in a safe location right now?"
-- "Is the person who did this still there?"
-
-=== ETHICAL GUIDELINES ===
-
-- EMPATHETIC: Acknowledge their stress. "I know this is scary."
-- SIMPLE: Plain language only. No medical jargon.
-- HELPFUL: Questions should help the situation, not just gather data.
-- NON-DISCRIMINATORY: Never ask about immigration, insurance, race, income.
-
-Respond ONLY with valid JSON:
-{
-    "missing_info": ["only info NOT already provided"],
-    "suggested_questions": ["One actionable, non-redundant question"],
-    "info_complete": false
-}
-
-Set info_complete to true if caller has provided: location + what happened + victim status.
-For P1/P2 emergencies, be LENIENT - help is already on the way."""
-
-    context = f"""Transcript: {state['transcript']}
-
-Extracted Information: {json.dumps(state.get('extracted', {}), indent=2)}
+    model = get_model(AGENT_MODEL_TIERS["next_question"], stream=True)
+    
+    template = (
+        NEXT_QUESTION_SENSITIVE_TEMPLATE
+        if SENSITIVE_TOPIC_PATTERN.search(state["transcript"])
+        else NEXT_QUESTION_TEMPLATE
+    )
+    messages = template.format_messages(
+        transcript=state["transcript"],
+        extracted=render_extracted(state),
+    )
+    
+    response = await model.ainvoke(messages, max_tokens=MAX_OUTPUT_TOKENS["next_question"])
+    
+    result = safe_json_parse(response.content, "next_question", json_mode=False)
+    
+    logger.info(
+        "[next_question] Info complete: %s, Missing: %d items",
+        result.get("info_complete"),
+        len(as_text_list(result.get("missing_info"))),
+    )
+    return {
+        "missing_info": as_text_list(result.get("missing_info")),
+        "suggested_questions": as_text_list(result.get("suggested_questions")),
+        "info_complete": result.get("info_complete") is True,
+    }
 
-Incident Type: {state.get('incident_type', 'unknown')}
-Severity: {state.get('severity', 'unknown')}"""
 
-    response = model.invoke([
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=context)
-    ])
+@with_error_handling("combined_assessment", {
+    "extracted": {},
+    "incident_type": "unknown - processing error",
+    "severity": "P2",
+    "key_risks": ["Unable to complete triage - manual review recommended"],
+    "missing_info": ["Unable to analyze - manual review needed"],
+    "suggested_questions": ["Can you confirm your exact location?", "Is anyone injured?", "Are you in a safe place?"],
+    "info_complete": False
+})
+async def combined_assessment_agent(state: DispatcherState) -> dict:
+    """
+    Combined Assessment Agent
     
-    result = safe_json_parse(response.content, "next_question")
-    if result is None:
-        return {
-            "missing_info": ["Unable to analyze"],
-            "suggested_questions": ["Can you confirm your exact location?"],
-            "info_complete": False
-        }
+    Does the work of extraction, triage and next_question in a single LLM
+    call for calls without life-threatening keywords (see route_intake).
+    Writes the same state keys as the three split agents, so routing and
+    everything downstream are unchanged.
+    """
+    model = get_model(AGENT_MODEL_TIERS["combined_assessment"])
     
-    logger.info(f"[next_question] Info complete: {result.get('info_complete')}, Missing: {len(result.get('missing_info', []))} items")
+    messages = COMBINED_ASSESSMENT_TEMPLATE.format_messages(transcript=state["transcript"])
+    response = await model.ainvoke(messages, max_tokens=MAX_OUTPUT_TOKENS["combined_assessment"])
+    
+    result = safe_json_parse(response.content, "combined_assessment")
+    extracted = result.get("extracted")
+    if not isinstance(extracted, dict):
+        extracted = {}
+    
+    logger.info(
+        "[combined_assessment] Incident: %s, Severity: %s, Info complete: %s",
+        result.get("incident_type"),
+        result.get("severity"),
+        result.get("info_complete"),
+    )
     return {
-        "missing_info": result.get("missing_info", []),
-        "suggested_questions": result.get("suggested_questions", []),
-        "info_complete": result.get("info_complete", False)
+        "extracted": extracted,
+        "extracted_json": extracted_to_prompt(extracted),
+        "incident_type": as_text(result.get("incident_type"), "unknown"),
+        "severity": as_text(result.get("severity")),
+        "key_risks": as_text_list(result.get("key_risks")),
+        "missing_info": as_text_list(result.get("missing_info")),
+        "suggested_questions": as_text_list(result.get("suggested_questions")),
+        "info_complete": result.get("info_complete") is True,
     }
 
 
@@ -396,15 +785,8 @@ def _get_default_dispatch(state: DispatcherState) -> dict:
     }
 
 
-@with_error_handling("dispatch_planner", lambda: {
-    "dispatch_recommendation": {
-        "resources": {"ems": "yes", "fire": "no", "police": "no"},
-        "priority": "P2",
-        "rationale": "Default dispatch due to processing error",
-        "special_units": []
-    }
-})
-def dispatch_planner_agent(state: DispatcherState) -> dict:
+@with_error_handling("dispatch_planner", _get_default_dispatch)
+async def dispatch_planner_agent(state: DispatcherState) -> dict:
     """
     Dispatch Planner Agent
     
@@ -413,38 +795,94 @@ def dispatch_planner_agent(state: DispatcherState) -> dict:
     - Priority level
     - Short rationale
     """
-    model = get_model()
+    model = get_model(AGENT_MODEL_TIERS["dispatch_planner"])
     
-    system_prompt = """You are a Dispatch Planner Agent for emergency services.
-Based on the incident information, recommend which resources to dispatch.
+    messages = DISPATCH_PLANNER_TEMPLATE.format_messages(
+        incident_type=state.get("incident_type", "unknown"),
+        severity=state.get("severity", "unknown"),
+        key_risks=", ".join(state.get("key_risks", [])),
+        extracted=render_extracted(state),
+        transcript=state["transcript"],
+    )
 
-Respond ONLY with valid JSON:
-{"resources": {"ems": "yes", "fire": "no", "police": "yes"}, "priority": "P1", "rationale": "Brief reason", "special_units": []}
+    response = await model.ainvoke(messages, max_tokens=MAX_OUTPUT_TOKENS["dispatch_planner"])
+    
+    result = safe_json_parse(response.content, "dispatch_planner")
+    
+    logger.info("[dispatch_planner] Resources: %s, Priority: %s", result.get("resources"), result.get("priority"))
+    return {"dispatch_recommendation": result}
 
-Rules:
-- ems/fire/police: "yes" if needed, "no" if not
-- priority: P1 (life-threatening), P2 (urgent), P3 (non-urgent), P4 (low)
-- special_units: HAZMAT, K9, SWAT if needed, otherwise empty []"""
 
-    context = f"""Incident Type: {state.get('incident_type', 'unknown')}
-Severity: {state.get('severity', 'unknown')}
-Key Risks: {', '.join(state.get('key_risks', []))}
+class ResourceUnit(NamedTuple):
+    """A dispatchable unit in the resource database."""
+    name: str
+    station: str
+    distance_miles: float
+    eta_minutes: int
+
 
-Extracted Information: {json.dumps(state.get('extracted', {}), indent=2)}
+# Dummy resource database (replace with MCP calls). Units per type are
+# immutable records sorted by ETA once at import, so the nearest unit is
+# always index 0 regardless of how entries are listed.
+RESOURCE_DATABASE = {
+    resource_type: tuple(sorted(units, key=attrgetter("eta_minutes")))
+    for resource_type, units in {
+        "ems": [
+            ResourceUnit("Medic Unit 7", "Station 7", 1.2, 4),
+            ResourceUnit("Ambulance 12", "Central Hospital", 2.5, 7),
+        ],
+        "fire": [
+            ResourceUnit("Engine 3", "Fire Station 3", 0.8, 3),
+            ResourceUnit("Ladder 1", "Fire Station 1", 1.5, 5),
+        ],
+        "police": [
+            ResourceUnit("Unit 42", "Patrol Zone 4", 0.5, 2),
+            ResourceUnit("Unit 17", "Patrol Zone 1", 1.8, 6),
+        ],
+    }.items()
+}
 
-Original Transcript: {state['transcript']}"""
 
-    response = model.invoke([
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=context)
-    ])
+def nearest_units(resource_type: str, k: int = 1) -> tuple[ResourceUnit, ...]:
+    """
+    Return the k nearest units of a resource type, nearest first.
     
-    result = safe_json_parse(response.content, "dispatch_planner")
-    if result is None:
-        return _get_default_dispatch(state)
+    Single lookup point into the resource data. Backed by the ETA-sorted
+    table, so this is a slice; when real station coordinates replace the
+    dummy data, a spatial index (e.g. a KD-tree per type) belongs here.
+    """
+    return RESOURCE_DATABASE.get(resource_type.lower(), ())[:k]
+
+
+# Output record for each type's nearest unit, built once at import. The
+# dummy data is static, so resource_locator_agent only adds the destination.
+NEAREST_RESOURCE_TEMPLATES = {
+    resource_type: {
+        "type": resource_type.upper(),
+        "unit": unit.name,
+        "station": unit.station,
+        "eta_minutes": unit.eta_minutes,
+        "distance_miles": unit.distance_miles,
+    }
+    for resource_type in RESOURCE_DATABASE
+    for unit in nearest_units(resource_type)
+}
+
+
+def normalize_resources_needed(resources_needed) -> list[str]:
+    """
+    Normalize the planner's resource list into lowercase resource types.
     
-    logger.info(f"[dispatch_planner] Resources: {result.get('resources')}, Priority: {result.get('priority')}")
-    return {"dispatch_recommendation": result}
+    Accepts both dict format {"ems": "yes"} and list format ["EMS", "FIRE"];
+    the result is ordered and de-duplicated.
+    """
+    if isinstance(resources_needed, dict):
+        needed_types = [rtype for rtype, needed in resources_needed.items() if needed == "yes"]
+    elif isinstance(resources_needed, list):
+        needed_types = resources_needed
+    else:
+        needed_types = []
+    return list(dict.fromkeys(rtype.lower() for rtype in needed_types))
 
 
 @with_error_handling("resource_locator", {"nearest_resources": []})
@@ -461,72 +899,31 @@ def resource_locator_agent(state: DispatcherState) -> dict:
     """
     # Get the resources we need to locate
     dispatch_rec = state.get("dispatch_recommendation", {})
-    resources_needed = dispatch_rec.get("resources", {})
-    location = state.get("extracted", {}).get("location", "Unknown location")
+    needed_types = normalize_resources_needed(dispatch_rec.get("resources", {}))
+    location = (state.get("extracted") or {}).get("location") or "Unknown location"
     
-    # Dummy resource database (replace with MCP calls)
-    resource_database = {
-        "ems": [
-            {"name": "Medic Unit 7", "station": "Station 7", "distance_miles": 1.2, "eta_minutes": 4},
-            {"name": "Ambulance 12", "station": "Central Hospital", "distance_miles": 2.5, "eta_minutes": 7},
-        ],
-        "fire": [
-            {"name": "Engine 3", "station": "Fire Station 3", "distance_miles": 0.8, "eta_minutes": 3},
-            {"name": "Ladder 1", "station": "Fire Station 1", "distance_miles": 1.5, "eta_minutes": 5},
-        ],
-        "police": [
-            {"name": "Unit 42", "station": "Patrol Zone 4", "distance_miles": 0.5, "eta_minutes": 2},
-            {"name": "Unit 17", "station": "Patrol Zone 1", "distance_miles": 1.8, "eta_minutes": 6},
-        ],
-    }
+    # Nearest unit for each type needed (types with no units are skipped)
+    nearest_resources = [
+        {**template, "destination": location}
+        for resource_type in needed_types
+        if (template := NEAREST_RESOURCE_TEMPLATES.get(resource_type))
+    ]
     
-    # Find nearest resources for each type needed
-    nearest_resources = []
-    
-    # Handle both dict format {"ems": "yes"} and list format ["EMS", "FIRE"]
-    if isinstance(resources_needed, dict):
-        for resource_type, needed in resources_needed.items():
-            if needed == "yes" and resource_type.lower() in resource_database:
-                available = resource_database[resource_type.lower()]
-                if available:
-                    nearest = available[0]
-                    nearest_resources.append({
-                        "type": resource_type.upper(),
-                        "unit": nearest["name"],
-                        "station": nearest["station"],
-                        "eta_minutes": nearest["eta_minutes"],
-                        "distance_miles": nearest["distance_miles"],
-                        "destination": location
-                    })
-    elif isinstance(resources_needed, list):
-        for resource_type in resources_needed:
-            if resource_type.lower() in resource_database:
-                available = resource_database[resource_type.lower()]
-                if available:
-                    nearest = available[0]
-                    nearest_resources.append({
-                        "type": resource_type.upper(),
-                        "unit": nearest["name"],
-                        "station": nearest["station"],
-                        "eta_minutes": nearest["eta_minutes"],
-                        "distance_miles": nearest["distance_miles"],
-                        "destination": location
-                    })
-    
-    logger.info(f"[resource_locator] Found {len(nearest_resources)} nearest resources")
+    logger.debug("[resource_locator] Found %d nearest resources", len(nearest_resources))
     return {"nearest_resources": nearest_resources}
 
 
-@with_error_handling("safety_guardrail", lambda: {
+@with_error_handling("safety_guardrail", lambda state: {
+    # Pass the unvalidated recommendation through, flagged for review
     "validated_output": {
         "is_valid": True,
-        "sanitized_recommendation": {},
+        "sanitized_recommendation": state.get("dispatch_recommendation", {}),
         "flags": ["Safety guardrail processing error - manual review required"],
         "blocked": False,
         "block_reason": None
     }
 })
-def safety_guardrail_agent(state: DispatcherState) -> dict:
+async def safety_guardrail_agent(state: DispatcherState) -> dict:
     """
     Safety Guardrail Agent
     
@@ -534,69 +931,83 @@ def safety_guardrail_agent(state: DispatcherState) -> dict:
     - Are framed as recommendations (not commands)
     - Use safe language
     - Pass structured output validation
+    
+    Its tokens are streamed to /dispatch/stream clients, with the
+    dispatcher_script placed first so it starts rendering immediately.
     """
-    model = get_model()
+    model = get_model(AGENT_MODEL_TIERS["safety_guardrail"], stream=True)
     
-    system_prompt = """You are a Safety Guardrail Agent for emergency dispatch.
-Your job is to validate and sanitize the dispatch recommendations before they are shown to the dispatcher.
+    messages = SAFETY_GUARDRAIL_TEMPLATE.format_messages(
+        incident_type=state.get("incident_type", "unknown"),
+        severity=state.get("severity", "unknown"),
+        dispatch_recommendation=to_prompt_json(state.get("dispatch_recommendation", {})),
+        nearest_resources=to_prompt_json(state.get("nearest_resources", [])),
+        key_risks=", ".join(state.get("key_risks", [])),
+    )
 
-Rules:
-1. Frame all outputs as RECOMMENDATIONS, not commands (e.g., "Recommend dispatching..." not "Dispatch...")
-2. Ensure no harmful or inappropriate language
-3. Verify the response makes sense given the incident
-4. Add safety reminders for responders if needed
-5. Flag any concerns about the recommendations
+    response = await model.ainvoke(messages, max_tokens=MAX_OUTPUT_TOKENS["safety_guardrail"])
+    
+    result = safe_json_parse(response.content, "safety_guardrail", json_mode=False)
+    
+    logger.info("[safety_guardrail] Valid: %s, Flags: %d", result.get("is_valid"), len(as_text_list(result.get("flags"))))
+    return {"validated_output": result}
 
-Respond ONLY with valid JSON in this exact format:
-{
-    "is_valid": true,
-    "sanitized_recommendation": {
-        "summary": "Brief summary of recommended action",
-        "resources": ["list of resources to dispatch"],
-        "priority": "P1/P2/P3/P4",
-        "eta_summary": "Nearest unit ETA",
-        "safety_notes": ["any safety reminders for responders"],
-        "dispatcher_script": "What the dispatcher should say to the caller"
-    },
-    "flags": ["any concerns or issues to highlight"],
-    "blocked": false,
-    "block_reason": null
-}"""
 
-    context = f"""Incident Type: {state.get('incident_type', 'unknown')}
-Severity: {state.get('severity', 'unknown')}
+# =============================================================================
+# Graph Construction
+# =============================================================================
 
-Dispatch Recommendation: {json.dumps(state.get('dispatch_recommendation', {}), indent=2)}
+def join_assessment(state: DispatcherState) -> dict:
+    """
+    Join point for the parallel triage and next_question branches.
+    
+    Adds nothing to the state; it exists so should_dispatch runs once,
+    after both branches have written their results.
+    """
+    return {}
 
-Nearest Resources: {json.dumps(state.get('nearest_resources', []), indent=2)}
 
-Key Risks: {', '.join(state.get('key_risks', []))}"""
+# Incident types that mean triage did not identify an incident (including
+# the triage fallback written on errors)
+_INVALID_INCIDENTS = frozenset({None, "", "unknown", "unknown - processing error"})
+URGENT_SEVERITIES = frozenset({"P1", "P2"})
 
-    response = model.invoke([
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=context)
-    ])
-    
-    result = safe_json_parse(response.content, "safety_guardrail")
-    if result is None:
-        # Fallback: pass through with warning
-        return {
-            "validated_output": {
-                "is_valid": True,
-                "sanitized_recommendation": state.get("dispatch_recommendation", {}),
-                "flags": ["Guardrail parsing failed - review manually"],
-                "blocked": False,
-                "block_reason": None
-            }
-        }
+
+# Opt-in single-call assessment for calls with no life-threatening keywords
+COMBINED_ASSESSMENT = os.getenv("COMBINED_ASSESSMENT", "false").lower() == "true"
+
+
+def route_intake(state: DispatcherState) -> list[str]:
+    """
+    Choose how a call is assessed.
     
-    logger.info(f"[safety_guardrail] Valid: {result.get('is_valid')}, Flags: {len(result.get('flags', []))}")
-    return {"validated_output": result}
+    By default extraction and triage run as separate concurrent agents, so
+    the dashboard gets staged results and P1 calls can dispatch early. With
+    COMBINED_ASSESSMENT enabled, calls that show no P1 keywords are assessed
+    by one combined LLM call instead of three.
+    """
+    if COMBINED_ASSESSMENT and not TRIAGE_FAST_P1_PATTERN.search(state["transcript"]):
+        return ["combined_assessment"]
+    return ["extraction", "triage"]
 
 
-# =============================================================================
-# Graph Construction
-# =============================================================================
+def route_after_triage(state: DispatcherState) -> str:
+    """
+    Fast path for life-threatening calls.
+    
+    A P1 incident goes to dispatch_planner as soon as triage finishes, so
+    planning runs alongside next_question instead of after it. should_dispatch
+    would dispatch these calls regardless of missing info, so nothing is
+    lost by not waiting. Anything else waits at the join for should_dispatch.
+    
+    Only triage's own output is visible here (extraction writes in the same
+    step), which is why the decision uses severity and incident type alone.
+    """
+    if state.get("severity") == "P1" and state.get("incident_type") not in _INVALID_INCIDENTS:
+        logger.info("[router] P1 emergency - dispatching without waiting for next_question")
+        return "dispatch_planner"
+    return END
+
 
 def should_dispatch(state: DispatcherState) -> str:
     """
@@ -606,15 +1017,20 @@ def should_dispatch(state: DispatcherState) -> str:
     Lives may be at stake - don't wait for complete information.
     
     For P3/P4 (non-urgent): Can wait for more complete information.
+    
+    Calls already sent to dispatch by route_after_triage end here.
     """
+    if state.get("dispatch_recommendation"):
+        return "already_dispatched"
+    
     severity = state.get("severity")
-    incident_type = state.get("incident_type", "unknown")
-    has_incident = incident_type and incident_type != "unknown"
+    incident_type = state.get("incident_type")
+    has_incident = incident_type not in _INVALID_INCIDENTS
     
     # P1/P2 emergencies: Dispatch immediately if we identified an incident
     # Don't wait for complete info - lives may be at stake
-    if severity in ("P1", "P2") and has_incident:
-        logger.info(f"[router] P1/P2 emergency ({incident_type}) - dispatching immediately")
+    if severity in URGENT_SEVERITIES and has_incident:
+        logger.info("[router] P1/P2 emergency (%s) - dispatching immediately", incident_type)
         return "dispatch_planner"
     
     # Check if info is complete
@@ -623,12 +1039,12 @@ def should_dispatch(state: DispatcherState) -> str:
         logger.info("[router] Info complete - proceeding to dispatch")
         return "dispatch_planner"
     
-    # For P3/P4: Check for minimum required info
-    extracted = state.get("extracted", {})
-    has_location = extracted.get("location") is not None
+    # For P3/P4: Check for minimum required info (an empty string from the
+    # model is no more a location than null is)
+    has_location = bool((state.get("extracted") or {}).get("location"))
     
     if has_location and has_incident:
-        logger.info(f"[router] Minimum info available (location + incident) - proceeding to dispatch")
+        logger.info("[router] Minimum info available (location + incident) - proceeding to dispatch")
         return "dispatch_planner"
     
     logger.info("[router] Insufficient info - waiting for more details before dispatch")
@@ -671,26 +1087,47 @@ def build_dispatcher_graph() -> StateGraph:
     graph.add_node("extraction", extraction_agent)
     graph.add_node("triage", triage_agent)
     graph.add_node("next_question", next_question_agent)
+    graph.add_node("combined_assessment", combined_assessment_agent)
     graph.add_node("dispatch_planner", dispatch_planner_agent)
     graph.add_node("resource_locator", resource_locator_agent)
     graph.add_node("safety_guardrail", safety_guardrail_agent)
     graph.add_node("wait_for_info", wait_for_info_node)
+    graph.add_node("join_assessment", join_assessment)
     
-    # Define the flow
-    graph.add_edge(START, "extraction")
-    graph.add_edge("extraction", "triage")
-    graph.add_edge("triage", "next_question")  # Always run next_question to detect missing info
+    # Define the flow. Triage only needs the transcript, so it runs
+    # concurrently with extraction; next_question needs the extracted
+    # details. Both branches join before routing, which puts the dispatch
+    # path at max(triage, extraction + next_question) model round trips.
+    # When enabled, route_intake sends low-stakes calls to the single-call
+    # combined_assessment instead, which routes straight to should_dispatch.
+    graph.add_conditional_edges(
+        START,
+        route_intake,
+        ["extraction", "triage", "combined_assessment"],
+    )
+    graph.add_edge("extraction", "next_question")
+    graph.add_edge(["triage", "next_question"], "join_assessment")
     
-    # Conditional edge: only proceed to dispatch if we have enough info
+    # P1 calls start dispatch planning alongside next_question; the join
+    # still runs once next_question finishes, then ends for these calls
     graph.add_conditional_edges(
-        "next_question",
-        should_dispatch,
+        "triage",
+        route_after_triage,
         {
             "dispatch_planner": "dispatch_planner",
-            "wait_for_info": "wait_for_info",
+            END: END,
         }
     )
     
+    # Conditional edge: only proceed to dispatch if we have enough info
+    dispatch_routes = {
+        "dispatch_planner": "dispatch_planner",
+        "wait_for_info": "wait_for_info",
+        "already_dispatched": END,
+    }
+    graph.add_conditional_edges("join_assessment", should_dispatch, dispatch_routes)
+    graph.add_conditional_edges("combined_assessment", should_dispatch, dispatch_routes)
+    
     # Dispatch flow
     graph.add_edge("dispatch_planner", "resource_locator")
     graph.add_edge("resource_locator", "safety_guardrail")
@@ -702,5 +1139,38 @@ def build_dispatcher_graph() -> StateGraph:
     return graph
 
 
-# Compile the graph
+# Compile the graph. The realtime graph deliberately has no checkpointer:
+# each request is a single self-contained run, so persisting state at every
+# node transition would only add writes to the hot path. Callers that need
+# persistence (e.g. audit replay) should compile their own copy with
+# build_dispatcher_graph().compile(checkpointer=...).
 dispatcher_graph = build_dispatcher_graph().compile()
+
+
+async def run_batch(transcripts: list[str], max_workers: int = 10) -> list[dict]:
+    """
+    Run many transcripts through the dispatcher graph concurrently.
+    
+    At most `max_workers` graph runs are in flight at once, which keeps
+    Groq rate limits in check while still overlapping the LLM round-trips
+    of different transcripts. Results are returned in input order. Each
+    run logs under its own call ID.
+    
+    Args:
+        transcripts: Transcripts to process (e.g. a training replay set)
+        max_workers: Maximum number of concurrent graph runs
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+    batch_id = call_id.get()
+    
+    async def run_one(index: int, transcript: str) -> dict:
+        # Each gather task runs in its own context copy, so this ID is
+        # isolated to this transcript's graph run; the log line links it
+        # back to the batch
+        new_call_id()
+        logger.debug("[batch] Starting item %d of batch %s", index, batch_id)
+        async with semaphore:
+            return await dispatcher_graph.ainvoke({"transcript": transcript, "messages": []})
+    
+    logger.info("[batch] Processing %d transcripts (max_workers=%d)", len(transcripts), max_workers)
+    return await asyncio.gather(*(run_one(i, t) for i, t in enumerate(transcripts)))
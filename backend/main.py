@@ -1,30 +1,86 @@
-import json
+import asyncio
+import hashlib
 import logging
 import os
-import traceback
-from typing import Generator
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import AsyncGenerator
 
 import httpx
+import orjson
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import StreamingResponse, JSONResponse, Response
+from langchain_core.messages import AIMessageChunk
+from langchain_core.utils.json import parse_partial_json
 from pydantic import BaseModel, field_validator
 
-from agents import dispatcher_graph
+from agents import CallIdFilter, close_http_clients, dispatcher_graph, new_call_id, run_batch
+from agents.cache import TTLCache, state_key
 
 # Fish Audio TTS configuration
 FISH_AUDIO_API_KEY = os.getenv("FISH_AUDIO_API_KEY")
 FISH_AUDIO_VOICE_ID = os.getenv("FISH_AUDIO_VOICE_ID", "")  # Optional: specific voice
 FISH_AUDIO_API_URL = "https://api.fish.audio/v1/tts"
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Shared keep-alive pool for Fish Audio, so repeat TTS calls skip the
+# TCP/TLS handshake. Closed in the app lifespan.
+tts_http_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(30.0, connect=5.0),
+    limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
 )
+
+# Synthesized MP3s by (voice, text). The dashboard speaks the same short
+# prompts and dispatcher responses repeatedly. Only clips up to
+# TTS_CACHE_MAX_CLIP_BYTES (~15 s of speech) are kept, so the cache holds at
+# most maxsize * TTS_CACHE_MAX_CLIP_BYTES (32 MB) however long the texts are.
+TTS_CACHE_MAX_CLIP_BYTES = 256 * 1024
+tts_audio_cache = TTLCache(maxsize=128, ttl=24 * 3600)
+
+# Finished /dispatch responses for exact (whitespace-normalized) repeat
+# transcripts, e.g. client retries and page refreshes. Exact match only:
+# near-duplicate transcripts can differ in exactly the detail that matters.
+dispatch_response_cache = TTLCache(maxsize=256, ttl=600)
+
+# Batch dispatch limits
+MAX_BATCH_SIZE = 500
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+# Configure logging
+# Records are queued on the calling thread and written to stderr by a
+# background listener, so a slow log consumer never blocks the event loop.
+# LOG_LEVEL=WARNING in production skips per-request INFO records entirely.
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - [%(call_id)s] %(message)s'
+))
+log_queue_handler = QueueHandler(log_queue)
+# Message only (plus any traceback); the stream formatter adds the prefix
+log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+# Tag every record with the ID of the dispatch call it belongs to. This must
+# run on the queueing side, where the call's context is still current.
+log_queue_handler.addFilter(CallIdFilter())
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), handlers=[log_queue_handler])
+log_listener = QueueListener(log_queue, log_stream_handler, respect_handler_level=True)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="FirstWave Emergency Dispatcher API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the log listener and release pooled upstream connections on shutdown."""
+    log_listener.start()
+    try:
+        yield
+        await close_http_clients()
+        await tts_http_client.aclose()
+    finally:
+        # Flushes any queued records before returning
+        log_listener.stop()
+
+
+app = FastAPI(title="FirstWave Emergency Dispatcher API", lifespan=lifespan)
 
 
 # =============================================================================
@@ -43,7 +99,7 @@ class APIError(Exception):
 @app.exception_handler(APIError)
 async def api_error_handler(request: Request, exc: APIError):
     """Handle custom API errors."""
-    logger.error(f"API Error: {exc.message} - Details: {exc.details}")
+    logger.error("API Error: %s - Details: %s", exc.message, exc.details)
     return JSONResponse(
         status_code=exc.status_code,
         content={
@@ -56,7 +112,7 @@ async def api_error_handler(request: Request, exc: APIError):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
-    logger.error(f"Unexpected error: {exc}\n{traceback.format_exc()}")
+    logger.error("Unexpected error: %s", exc, exc_info=exc)
     return JSONResponse(
         status_code=500,
         content={
@@ -71,7 +127,11 @@ async def general_exception_handler(request: Request, exc: Exception):
 # =============================================================================
 
 # Allow configurable origins (comma-separated in env var, or default to localhost)
-allowed_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
+allowed_origins = [
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+]
 
 app.add_middleware(
     CORSMiddleware,
@@ -79,8 +139,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Dispatch-Id"],
+    max_age=86400,  # Let browsers cache preflight results for a day
 )
 
+# Compress JSON responses (dispatch results, batch runs). Starlette's default
+# exclusions (>=1.5, pinned in requirements.txt) leave text/event-stream and
+# audio/* untouched, so SSE frames and TTS audio still flush chunk by chunk.
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=6)
+
 
 # =============================================================================
 # Request/Response Models
@@ -92,11 +159,12 @@ class DispatchRequest(BaseModel):
     @field_validator('transcript')
     @classmethod
     def validate_transcript(cls, v: str) -> str:
-        if not v or not v.strip():
+        v = v.strip()
+        if not v:
             raise ValueError('Transcript cannot be empty')
         if len(v) > 50000:  # 50KB limit
             raise ValueError('Transcript is too long (max 50,000 characters)')
-        return v.strip()
+        return v
 
 
 class DispatchResponse(BaseModel):
@@ -119,11 +187,12 @@ class TTSRequest(BaseModel):
     @field_validator('text')
     @classmethod
     def validate_text(cls, v: str) -> str:
-        if not v or not v.strip():
+        v = v.strip()
+        if not v:
             raise ValueError('Text cannot be empty')
         if len(v) > 5000:  # 5KB limit for TTS
             raise ValueError('Text is too long (max 5,000 characters)')
-        return v.strip()
+        return v
 
 
 # =============================================================================
@@ -157,7 +226,7 @@ async def text_to_speech(request: TTSRequest):
     """
     Convert text to speech using Fish Audio API.
     
-    Returns audio bytes (MP3 format) that can be played directly.
+    Streams audio bytes (MP3 format) that can be played directly.
     """
     if not FISH_AUDIO_API_KEY:
         logger.error("Fish Audio API key not configured")
@@ -167,52 +236,84 @@ async def text_to_speech(request: TTSRequest):
             details="FISH_AUDIO_API_KEY environment variable is not set"
         )
     
-    logger.info(f"TTS request (text length: {len(request.text)})")
+    logger.info("TTS request (text length: %d)", len(request.text))
     
     # Use provided voice_id or fall back to configured default
     voice_id = request.voice_id or FISH_AUDIO_VOICE_ID
     
+    audio_headers = {
+        "Content-Disposition": "inline",
+        "Cache-Control": "no-cache",
+    }
+    cache_key = hashlib.sha256(f"{voice_id}|{request.text}".encode()).hexdigest()
+    cached_audio = tts_audio_cache.get(cache_key)
+    if cached_audio is not None:
+        logger.info("Serving cached TTS audio")
+        return Response(content=cached_audio, media_type="audio/mpeg", headers=audio_headers)
+    
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Build request payload
-            payload = {
-                "text": request.text,
-                "format": "mp3",
-            }
-            
-            # Add voice reference if specified
-            if voice_id:
-                payload["reference_id"] = voice_id
-            
-            response = await client.post(
-                FISH_AUDIO_API_URL,
-                headers={
-                    "Authorization": f"Bearer {FISH_AUDIO_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json=payload,
-            )
-            
-            if response.status_code != 200:
-                error_text = response.text
-                logger.error(f"Fish Audio API error: {response.status_code} - {error_text}")
-                raise APIError(
-                    status_code=502,
-                    message="TTS service error",
-                    details=f"Fish Audio returned {response.status_code}"
-                )
-            
-            # Return audio bytes directly
-            logger.info("TTS audio generated successfully")
-            return Response(
-                content=response.content,
-                media_type="audio/mpeg",
-                headers={
-                    "Content-Disposition": "inline",
-                    "Cache-Control": "no-cache",
-                }
+        # Build request payload
+        payload = {
+            "text": request.text,
+            "format": "mp3",
+        }
+        
+        # Add voice reference if specified
+        if voice_id:
+            payload["reference_id"] = voice_id
+        
+        upstream_request = tts_http_client.build_request(
+            "POST",
+            FISH_AUDIO_API_URL,
+            headers={
+                "Authorization": f"Bearer {FISH_AUDIO_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            content=orjson.dumps(payload),
+        )
+        # Only the status line and headers are read here; the body is
+        # relayed below as it arrives
+        response = await tts_http_client.send(upstream_request, stream=True)
+        
+        if response.status_code != 200:
+            error_text = (await response.aread()).decode(errors="replace")
+            await response.aclose()
+            logger.error("Fish Audio API error: %s - %s", response.status_code, error_text)
+            raise APIError(
+                status_code=502,
+                message="TTS service error",
+                details=f"Fish Audio returned {response.status_code}"
             )
-            
+        
+        async def relay_audio() -> AsyncGenerator[bytes, None]:
+            """Relay audio chunks, caching short clips once fully arrived."""
+            try:
+                chunks: list[bytes] | None = []
+                size = 0
+                async for chunk in response.aiter_bytes(chunk_size=16384):
+                    if chunks is not None:
+                        size += len(chunk)
+                        if size > TTS_CACHE_MAX_CLIP_BYTES:
+                            chunks = None  # Too long to cache - stop holding the chunks
+                        else:
+                            chunks.append(chunk)
+                    yield chunk
+                if chunks is not None:
+                    tts_audio_cache.set(cache_key, b"".join(chunks))
+            finally:
+                # Return the connection to the pool even if the upstream
+                # stream fails or the client disconnects mid-clip
+                await response.aclose()
+        
+        # Stream audio chunks through as they arrive, so playback can start
+        # before synthesis finishes
+        logger.info("TTS audio stream started")
+        return StreamingResponse(
+            relay_audio(),
+            media_type="audio/mpeg",
+            headers=audio_headers,
+        )
+        
     except httpx.TimeoutException:
         logger.error("Fish Audio API timeout")
         raise APIError(
@@ -221,7 +322,7 @@ async def text_to_speech(request: TTSRequest):
             details="Fish Audio API took too long to respond"
         )
     except httpx.RequestError as e:
-        logger.error(f"Fish Audio API request error: {e}")
+        logger.error("Fish Audio API request error: %s", e)
         raise APIError(
             status_code=502,
             message="TTS service unavailable",
@@ -233,8 +334,31 @@ async def text_to_speech(request: TTSRequest):
 # Dispatch Endpoints
 # =============================================================================
 
+def build_dispatch_response(result: dict) -> DispatchResponse:
+    """
+    Build the API response from a finished graph run's state.
+    
+    Uses model_construct to skip re-validating the nested dicts. The agents
+    coerce model output to the declared types (safe_json_parse only returns
+    objects; as_text/as_text_list normalize scalar and list fields) and every
+    fallback is typed, so the graph state already matches DispatchResponse.
+    """
+    return DispatchResponse.model_construct(
+        extracted=result.get("extracted", {}),
+        incident_type=result.get("incident_type", "unknown"),
+        severity=result.get("severity"),
+        key_risks=result.get("key_risks", []),
+        missing_info=result.get("missing_info", []),
+        suggested_questions=result.get("suggested_questions", []),
+        info_complete=result.get("info_complete", False),
+        dispatch_recommendation=result.get("dispatch_recommendation", {}),
+        nearest_resources=result.get("nearest_resources", []),
+        validated_output=result.get("validated_output", {}),
+    )
+
+
 @app.post("/dispatch", response_model=DispatchResponse)
-def dispatch_emergency(request: DispatchRequest):
+async def dispatch_emergency(request: DispatchRequest):
     """
     Process an emergency transcript through the dispatcher agent graph.
     
@@ -243,47 +367,43 @@ def dispatch_emergency(request: DispatchRequest):
     This endpoint processes the entire pipeline synchronously and returns
     all results at once. For real-time updates, use /dispatch/stream instead.
     """
-    logger.info(f"Processing dispatch request (transcript length: {len(request.transcript)})")
+    new_call_id()
+    logger.info("Processing dispatch request (transcript length: %d)", len(request.transcript))
+    
+    cache_key = state_key({"transcript": request.transcript}, ("transcript",))
+    cached = dispatch_response_cache.get(cache_key)
+    if cached is not None:
+        logger.info("Serving cached dispatch response")
+        return cached
     
     try:
         # Run the graph with the transcript
-        result = dispatcher_graph.invoke({
+        result = await dispatcher_graph.ainvoke({
             "transcript": request.transcript,
             "messages": [],
         })
         
-        # Check for any agent errors in the result
-        errors = []
-        for key, value in result.items():
-            if isinstance(value, dict) and "_error" in value:
-                errors.append(f"{key}: {value['_error']}")
+        # Agents that fell back to default output report it in agent_errors
+        errors = result.get("agent_errors", [])
         
+        response = build_dispatch_response(result)
         if errors:
-            logger.warning(f"Dispatch completed with errors: {errors}")
+            logger.warning("Dispatch completed with errors: %s", errors)
+        else:
+            dispatch_response_cache.set(cache_key, response)
         
-        return DispatchResponse(
-            extracted=result.get("extracted", {}),
-            incident_type=result.get("incident_type", "unknown"),
-            severity=result.get("severity"),
-            key_risks=result.get("key_risks", []),
-            missing_info=result.get("missing_info", []),
-            suggested_questions=result.get("suggested_questions", []),
-            info_complete=result.get("info_complete", False),
-            dispatch_recommendation=result.get("dispatch_recommendation", {}),
-            nearest_resources=result.get("nearest_resources", []),
-            validated_output=result.get("validated_output", {}),
-        )
+        return response
         
     except ValueError as e:
         # Configuration errors (e.g., missing API key)
-        logger.error(f"Configuration error: {e}")
+        logger.error("Configuration error: %s", e)
         raise APIError(
             status_code=500,
             message="Service configuration error",
             details=str(e)
         )
     except Exception as e:
-        logger.error(f"Dispatch processing error: {e}\n{traceback.format_exc()}")
+        logger.exception("Dispatch processing error: %s", e)
         raise APIError(
             status_code=500,
             message="Failed to process dispatch request",
@@ -291,68 +411,259 @@ def dispatch_emergency(request: DispatchRequest):
         )
 
 
-def event_generator(transcript: str) -> Generator[str, None, None]:
+@app.post("/dispatch/batch", response_model=list[DispatchResponse])
+async def dispatch_batch(requests: list[DispatchRequest]):
+    """
+    Process many transcripts in one request (training replays, evaluation runs).
+    
+    Graph runs are overlapped with bounded concurrency so the LLM round
+    trips of different transcripts share the wall-clock time instead of
+    adding up. Responses are returned in request order.
+    """
+    if len(requests) > MAX_BATCH_SIZE:
+        raise APIError(
+            status_code=400,
+            message="Batch is too large",
+            details=f"At most {MAX_BATCH_SIZE} transcripts per batch"
+        )
+    
+    new_call_id()
+    logger.info("Processing dispatch batch (%d transcripts)", len(requests))
+    
+    try:
+        results = await run_batch(
+            [request.transcript for request in requests],
+            max_workers=BATCH_CONCURRENCY,
+        )
+        return [build_dispatch_response(result) for result in results]
+        
+    except ValueError as e:
+        logger.error("Configuration error: %s", e)
+        raise APIError(
+            status_code=500,
+            message="Service configuration error",
+            details=str(e)
+        )
+    except Exception as e:
+        logger.exception("Batch dispatch error: %s", e)
+        raise APIError(
+            status_code=500,
+            message="Failed to process dispatch batch",
+            details=str(e)
+        )
+
+
+# SSE comment sent ahead of the first event. Some proxies and browsers hold
+# back the first couple of KB of a response; padding past that makes the
+# extraction event render as soon as it is emitted.
+SSE_PADDING = b":" + b" " * 2048 + b"\n\n"
+
+# Static SSE framing, built once rather than per event
+SSE_DATA_PREFIX = b"data: "
+SSE_PARTIAL_PREFIX = b"event: partial\ndata: "
+SSE_ERROR_PREFIX = b"event: error\ndata: "
+SSE_EVENT_END = b"\n\n"
+SSE_DONE = b"event: done\ndata: {}\n\n"
+SSE_LAGGED = SSE_ERROR_PREFIX + b'{"error":"Stream fell too far behind"}' + SSE_EVENT_END
+
+
+async def event_generator(transcript: str) -> AsyncGenerator[bytes, None]:
     """
     Generator that streams agent outputs as Server-Sent Events.
     
     Each event contains the agent name and its output data.
     Includes error handling for individual agent failures.
+    
+    Events are yielded as encoded bytes: orjson serializes straight to
+    UTF-8, so payloads are never decoded to str and re-encoded.
     """
     try:
-        logger.info(f"Starting stream processing (transcript length: {len(transcript)})")
+        logger.info("Starting stream processing (transcript length: %d)", len(transcript))
+        yield SSE_PADDING
         event_count = 0
+        partial_buffers: dict[str, str] = {}  # Streamed text so far, per agent
         
-        for output in dispatcher_graph.stream({"transcript": transcript, "messages": []}):
+        async for mode, output in dispatcher_graph.astream(
+            {"transcript": transcript, "messages": []},
+            stream_mode=["updates", "messages"],
+        ):
+            if mode == "messages":
+                # Token chunk from a streaming agent - forward it as a partial event
+                message, metadata = output
+                if isinstance(message, AIMessageChunk) and message.content:
+                    agent = metadata.get("langgraph_node")
+                    buffer = partial_buffers.get(agent, "") + message.content
+                    partial_buffers[agent] = buffer
+                    try:
+                        # Best-effort parse of the incomplete JSON seen so far
+                        snapshot = parse_partial_json(buffer)
+                    except ValueError:
+                        snapshot = None
+                    partial_data = orjson.dumps({
+                        "agent": agent,
+                        "delta": message.content,
+                        "data": snapshot,
+                    })
+                    yield SSE_PARTIAL_PREFIX + partial_data + SSE_EVENT_END
+                continue
+            
             # Each output is a dict with the node name as key
-            node_name = list(output.keys())[0]
-            node_output = output[node_name]
+            node_name, node_output = next(iter(output.items()))
+            
+            # Structural nodes (e.g. branch joins) have nothing to show
+            if not node_output:
+                continue
+            
+            # Prompt-only renderings duplicate fields already in the event
+            if isinstance(node_output, dict) and "extracted_json" in node_output:
+                node_output = {
+                    key: value for key, value in node_output.items() if key != "extracted_json"
+                }
             
             # Check for agent-level errors
-            if isinstance(node_output, dict) and "_error" in node_output:
-                logger.warning(f"Agent {node_name} error: {node_output['_error']}")
+            if isinstance(node_output, dict) and "agent_errors" in node_output:
+                logger.warning("Agent %s error: %s", node_name, node_output["agent_errors"])
                 # Include error info in the event but don't stop processing
                 node_output["_had_error"] = True
             
             # Emit SSE event with agent name and data
             try:
-                event_data = json.dumps({"agent": node_name, "data": node_output})
-                yield f"data: {event_data}\n\n"
+                event_data = orjson.dumps({"agent": node_name, "data": node_output})
+                yield SSE_DATA_PREFIX + event_data + SSE_EVENT_END
                 event_count += 1
-                logger.debug(f"Emitted event {event_count}: {node_name}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Emitted event %d: %s", event_count, node_name)
             except (TypeError, ValueError) as e:
                 # JSON serialization error - send error event but continue
-                logger.error(f"Failed to serialize {node_name} output: {e}")
-                error_data = json.dumps({
+                logger.error("Failed to serialize %s output: %s", node_name, e)
+                error_data = orjson.dumps({
                     "agent": node_name,
                     "data": {"_error": f"Serialization error: {str(e)}"}
                 })
-                yield f"data: {error_data}\n\n"
+                yield SSE_DATA_PREFIX + error_data + SSE_EVENT_END
         
         # Send completion event
-        logger.info(f"Stream completed successfully ({event_count} events)")
-        yield "event: done\ndata: {}\n\n"
+        logger.info("Stream completed successfully (%d events)", event_count)
+        yield SSE_DONE
         
     except ValueError as e:
         # Configuration errors
-        logger.error(f"Stream configuration error: {e}")
-        error_data = json.dumps({"error": f"Configuration error: {str(e)}"})
-        yield f"event: error\ndata: {error_data}\n\n"
+        logger.error("Stream configuration error: %s", e)
+        error_data = orjson.dumps({"error": f"Configuration error: {str(e)}"})
+        yield SSE_ERROR_PREFIX + error_data + SSE_EVENT_END
         
     except ConnectionError as e:
         # Network/API connectivity issues
-        logger.error(f"Stream connection error: {e}")
-        error_data = json.dumps({"error": "Connection error - please try again"})
-        yield f"event: error\ndata: {error_data}\n\n"
+        logger.error("Stream connection error: %s", e)
+        error_data = orjson.dumps({"error": "Connection error - please try again"})
+        yield SSE_ERROR_PREFIX + error_data + SSE_EVENT_END
         
     except Exception as e:
         # Unexpected errors
-        logger.error(f"Stream error: {e}\n{traceback.format_exc()}")
-        error_data = json.dumps({"error": str(e)})
-        yield f"event: error\ndata: {error_data}\n\n"
+        logger.exception("Stream error: %s", e)
+        error_data = orjson.dumps({"error": str(e)})
+        yield SSE_ERROR_PREFIX + error_data + SSE_EVENT_END
+
+
+class DispatchBroadcast:
+    """
+    Fan-out of one dispatch run's SSE events to every subscriber.
+    
+    A single producer consumes the graph stream and publishes each event
+    already encoded, so extra viewers of the same call (e.g. a supervisor
+    alongside the call-taker) cost a queue put instead of a re-run of the
+    pipeline or a re-serialization. Late subscribers replay earlier events.
+    When the last subscriber leaves (or none attaches in time), the run is
+    cancelled so no model calls are spent on a stream nobody is reading.
+    Subscribers that fall SUBSCRIBER_QUEUE_SIZE events behind are dropped.
+    """
+
+    def __init__(self) -> None:
+        self.history: list[bytes] = []
+        self.subscribers: set[asyncio.Queue[bytes | None]] = set()
+        self.closed = False
+        self.task: asyncio.Task | None = None
+
+    def publish(self, event: bytes) -> None:
+        self.history.append(event)
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(queue)
+
+    def close(self) -> None:
+        self.closed = True
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(None)
+            except asyncio.QueueFull:
+                self._drop(queue)
+
+    def cancel_if_unwatched(self) -> None:
+        """Stop the run if nobody is subscribed to it."""
+        if not self.subscribers and not self.closed and self.task is not None:
+            self.task.cancel()
+
+    def _drop(self, queue: asyncio.Queue[bytes | None]) -> None:
+        """Disconnect a subscriber that can't keep up, telling it why."""
+        self.subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(SSE_LAGGED)
+        queue.put_nowait(None)
+
+    async def subscribe(self) -> AsyncGenerator[bytes, None]:
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        # Snapshot the history and register in the same step, so events
+        # published during the replay queue up behind it in order
+        replay = list(self.history)
+        if self.closed:
+            queue.put_nowait(None)
+        else:
+            self.subscribers.add(queue)
+        try:
+            for event in replay:
+                yield event
+            while (event := await queue.get()) is not None:
+                yield event
+        finally:
+            self.subscribers.discard(queue)
+            self.cancel_if_unwatched()
+
+
+# In-flight streamed dispatches by call ID
+active_dispatches: dict[str, DispatchBroadcast] = {}
+
+# Events a subscriber may fall behind before it is dropped (token-level
+# partial events make a full run a few hundred events)
+SUBSCRIBER_QUEUE_SIZE = 1024
+
+# Seconds a new run waits for its first subscriber, e.g. when the client
+# disconnects before the response body starts streaming
+SUBSCRIBE_TIMEOUT = 5.0
+
+
+async def produce_dispatch_events(dispatch_id: str, transcript: str) -> None:
+    """Run one dispatch and publish its events until the stream ends."""
+    broadcast = active_dispatches[dispatch_id]
+    try:
+        async for event in event_generator(transcript):
+            broadcast.publish(event)
+    finally:
+        broadcast.close()
+        del active_dispatches[dispatch_id]
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable nginx buffering
+}
 
 
 @app.post("/dispatch/stream")
-def dispatch_stream(request: DispatchRequest):
+async def dispatch_stream(request: DispatchRequest):
     """
     Stream emergency dispatch processing via Server-Sent Events.
     
@@ -361,23 +672,71 @@ def dispatch_stream(request: DispatchRequest):
     
     Event types:
     - data: Regular data event with agent output
+    - partial: Token delta from a streaming agent,
+      {"agent": ..., "delta": "...", "data": { ... partial JSON parsed so far ... }}
     - done: Stream completed successfully
     - error: An error occurred during processing
     
+    The stream opens with an SSE comment line (": ...") used as padding;
+    clients should ignore it.
+    
     Each data event contains:
     {
         "agent": "agent_name",
         "data": { ... agent output ... }
     }
+    
+    The X-Dispatch-Id response header identifies the run; other clients can
+    follow it via GET /dispatch/{dispatch_id}/stream while it is in flight.
+    The run stops once every client following it has disconnected.
     """
-    logger.info(f"Stream dispatch request (transcript length: {len(request.transcript)})")
+    # Set before the producer starts so its task inherits the call ID
+    dispatch_id = new_call_id()
+    logger.info("Stream dispatch request (transcript length: %d)", len(request.transcript))
+    
+    broadcast = DispatchBroadcast()
+    active_dispatches[dispatch_id] = broadcast
+    broadcast.task = asyncio.create_task(produce_dispatch_events(dispatch_id, request.transcript))
+    asyncio.get_running_loop().call_later(SUBSCRIBE_TIMEOUT, broadcast.cancel_if_unwatched)
     
     return StreamingResponse(
-        event_generator(request.transcript),
+        broadcast.subscribe(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # Disable nginx buffering
-        }
+        headers={**SSE_HEADERS, "X-Dispatch-Id": dispatch_id},
+    )
+
+
+@app.get("/dispatch/{dispatch_id}/stream")
+async def follow_dispatch_stream(dispatch_id: str):
+    """
+    Follow an in-flight streamed dispatch started by another client.
+    
+    Replays the events emitted so far, then continues live with the same
+    event format as POST /dispatch/stream.
+    """
+    broadcast = active_dispatches.get(dispatch_id)
+    if broadcast is None:
+        raise APIError(
+            status_code=404,
+            message="Dispatch not found",
+            details="The dispatch has finished or never existed"
+        )
+    
+    return StreamingResponse(
+        broadcast.subscribe(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # With uvicorn[standard] installed, the default "auto" loop and HTTP
+    # implementations resolve to uvloop and httptools
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
     )
@@ -273,48 +273,67 @@ function EmergencyDashboardContent() {
     const { agent, data } = event
     setCurrentAgent(agent)
 
+    const applyExtraction = () => {
+      setSummaryData((prev) => ({
+        ...prev,
+        // Hardcoded for demo - always show San Jose State University
+        location: "San Jose State University",
+      }))
+    }
+
+    const applyTriage = (triageData: TriageData) => {
+      setSummaryData((prev) => ({
+        ...prev,
+        incident: triageData.incident_type || prev.incident,
+        priority: triageData.severity || prev.priority,
+        keyFacts: triageData.key_risks || prev.keyFacts,
+      }))
+      // Also update dispatch priority early
+      if (triageData.severity) {
+        updateDispatch((prev) => ({
+          ...prev,
+          priority: triageData.severity || prev.priority,
+        }))
+      }
+    }
+
+    const applyNextQuestion = (questionData: NextQuestionData) => {
+      setSummaryData((prev) => ({
+        ...prev,
+        missingInfo: questionData.missing_info || prev.missingInfo,
+      }))
+      // Store for end-of-stream AI message
+      streamStateRef.current = {
+        suggested_questions: questionData.suggested_questions || [],
+        missing_info: questionData.missing_info || [],
+        info_complete: questionData.info_complete || false,
+      }
+    }
+
     try {
       switch (agent) {
         case "extraction": {
-          const extractionData = data as ExtractionData
-          setSummaryData((prev) => ({
-            ...prev,
-            // Hardcoded for demo - always show San Jose State University
-            location: "San Jose State University",
-          }))
+          applyExtraction()
           break
         }
 
         case "triage": {
-          const triageData = data as TriageData
-          setSummaryData((prev) => ({
-            ...prev,
-            incident: triageData.incident_type || prev.incident,
-            priority: triageData.severity || prev.priority,
-            keyFacts: triageData.key_risks || prev.keyFacts,
-          }))
-          // Also update dispatch priority early
-          if (triageData.severity) {
-            updateDispatch((prev) => ({
-              ...prev,
-              priority: triageData.severity || prev.priority,
-            }))
-          }
+          applyTriage(data as TriageData)
           break
         }
 
         case "next_question": {
-          const questionData = data as NextQuestionData
-          setSummaryData((prev) => ({
-            ...prev,
-            missingInfo: questionData.missing_info || prev.missingInfo,
-          }))
-          // Store for end-of-stream AI message
-          streamStateRef.current = {
-            suggested_questions: questionData.suggested_questions || [],
-            missing_info: questionData.missing_info || [],
-            info_complete: questionData.info_complete || false,
+          applyNextQuestion(data as NextQuestionData)
+          break
+        }
+
+        case "combined_assessment": {
+          // Single-call assessment carries the extraction, triage and next-question fields
+          if ("extracted" in data) {
+            applyExtraction()
           }
+          applyTriage(data as TriageData)
+          applyNextQuestion(data as NextQuestionData)
           break
         }
 
@@ -477,8 +496,8 @@ function EmergencyDashboardContent() {
         buffer = events.pop() || "" // Keep incomplete event in buffer
 
         for (const eventText of events) {
-          if (!eventText.trim()) continue
-          eventCount++
+          // Skip blank chunks and SSE comments (the server pads the stream start)
+          if (!eventText.trim() || eventText.startsWith(":")) continue
 
           // Parse SSE format
           const lines = eventText.split("\n")
@@ -493,6 +512,11 @@ function EmergencyDashboardContent() {
             }
           }
 
+          // Token deltas from streaming agents - the final agent event carries
+          // the complete output, so partials don't count toward the event limit
+          if (eventType === "partial") continue
+          eventCount++
+
           // Handle different event types
           if (eventType === "done") {
             // Stream complete - add AI message if needed